@@ -0,0 +1,39 @@
+import asyncio
+import functools
+from typing import Callable, List, Tuple
+
+import final_bizinfo
+import iris_alert
+import kstartup_alert
+
+# 세 스크래퍼는 서로 독립적인 I/O 작업이라 순차 실행할 필요가 없음
+# -> 각 main()을 스레드에서 동시에 돌려서 전체 소요시간을 max(각 실행시간) 수준으로
+JOBS: List[Tuple[str, Callable[[], None]]] = [
+    ("Bizinfo", functools.partial(final_bizinfo.main, [])),  # alerts_main 인자가 넘어가지 않도록
+    ("IRIS", iris_alert.main),
+    ("K-Startup", kstartup_alert.main),
+]
+
+
+async def run_job(name: str, fn: Callable[[], None]) -> bool:
+    # 하나가 실패해도 나머지는 끝까지 돌리고, 실패 여부만 모아서 반환
+    try:
+        await asyncio.to_thread(fn)
+    except (Exception, SystemExit) as e:
+        print(f"[{name}] 실패: {e}")
+        return False
+    return True
+
+
+async def run() -> bool:
+    results = await asyncio.gather(*(run_job(name, fn) for name, fn in JOBS))
+    return all(results)
+
+
+def main():
+    if not asyncio.run(run()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
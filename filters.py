@@ -0,0 +1,110 @@
+"""
+Bizinfo 공고 키워드 필터 / 카테고리 분류.
+
+공고 200건 x 용어 수십 개를 매 실행마다 훑는 구간이라 별도 모듈로 분리했습니다.
+CI에서는 `mypyc filters.py`로 C 확장(.so)으로 컴파일해서 사용하고,
+컴파일하지 않아도 일반 파이썬 모듈로 그대로 동작합니다.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 1) 키워드(최종 필터) - 너무 넓으면 폭탄이 나서, 아래 matches_keywords는 "완화"로 유지하고
+#    실제 전송은 classify_item()으로 카테고리화 + 요약 전송으로 운영합니다.
+KEYWORDS: Tuple[str, ...] = (
+    "전북", "전라북도", "전북특별자치도",
+    "충남", "충청남도", "천안", "천안시",
+    "융자", "대출", "자금", "자금지원", "정책자금", "보증", "이차보전",
+    "수출", "수출지원", "해외진출", "바우처", "수출바우처",
+    "과제", "R&D", "r&d", "연구개발", "지원사업", "사업화", "실증", "PoC", "테스트베드", "검증"
+)
+
+# 2) 카테고리 분류용 용어 (classify_item)
+JEONBUK_TERMS: Tuple[str, ...] = (
+    "전북", "전라북도", "전북특별자치도",
+    "전주시", "군산시", "익산시", "정읍시", "남원시", "김제시",
+    "완주군", "진안군", "무주군", "장수군", "임실군", "순창군",
+    "고창군", "부안군"
+)
+
+# 충남은 아직 "충남/충청남도/천안" 중심 (원하면 충남 전 시·군도 확장 가능)
+CHUNGNAM_TERMS: Tuple[str, ...] = ("충남", "충청남도", "천안", "천안시")
+
+FIN_TERMS: Tuple[str, ...] = ("융자", "대출", "정책자금", "보증", "이차보전", "자금", "자금지원", "운전자금", "시설자금")
+EXPORT_TERMS: Tuple[str, ...] = ("수출", "해외진출", "수출지원", "수출바우처", "바우처", "해외마케팅", "해외전시", "무역", "통상")
+RND_TERMS: Tuple[str, ...] = ("과제", "R&D", "r&d", "연구개발", "지원사업", "사업화", "실증", "PoC", "poc", "테스트베드", "검증", "시범", "데모")
+
+
+def compile_terms(terms: Iterable[str]) -> "re.Pattern[str]":
+    # 용어 목록을 하나의 alternation 정규식으로 -> any(k in text ...) 루프 대신 C 레벨 검색 1회
+    return re.compile("|".join(re.escape(t) for t in terms))
+
+
+_RE_KEYWORDS = compile_terms(KEYWORDS)
+_RE_EXPORT = compile_terms(EXPORT_TERMS)
+_RE_FIN = compile_terms(FIN_TERMS)
+_RE_RND = compile_terms(RND_TERMS)
+_RE_JEONBUK = compile_terms(JEONBUK_TERMS)
+_RE_CHUNGNAM = compile_terms(CHUNGNAM_TERMS)
+
+# 우선순위: 목적형(수출/금융/R&D) → 지역
+CATEGORY_ORDER: List[Tuple["re.Pattern[str]", str]] = [
+    (_RE_EXPORT, "수출"),
+    (_RE_FIN, "융자·자금"),
+    (_RE_RND, "R&D·사업화"),
+    (_RE_JEONBUK, "전북"),
+    (_RE_CHUNGNAM, "충남·천안"),
+]
+
+# 필터별로 보는 필드 (1차 필터는 기관명까지, 분류는 제목/본문/해시태그 위주)
+MATCH_FIELDS: Tuple[str, ...] = (
+    "title", "pblancNm", "description", "author", "excInsttNm", "hashTags", "reqstDt", "link",
+)
+CLASSIFY_FIELDS: Tuple[str, ...] = (
+    "title", "pblancNm", "description", "hashTags", "hashtags", "reqstDt", "link",
+)
+
+
+def item_text(item: Dict[str, Any], key: str, fields: Tuple[str, ...]) -> str:
+    """
+    fields를 이어붙인 검색용 본문을 항목당 한 번만 만들어 item[key]에 보관합니다.
+    """
+    b = item.get(key)
+    if b is None:
+        b = " ".join(map(str, filter(None, map(item.get, fields))))
+        item[key] = b
+    return b
+
+
+def match_text(item: Dict[str, Any]) -> str:
+    # matches_keywords 용 (MATCH_FIELDS)
+    return item_text(item, "_match_blob", MATCH_FIELDS)
+
+
+def classify_text(item: Dict[str, Any]) -> str:
+    # classify_item 용 (CLASSIFY_FIELDS)
+    return item_text(item, "_class_blob", CLASSIFY_FIELDS)
+
+
+def matches_keywords(text: str) -> bool:
+    """
+    1차 완화 필터: 여기서 너무 빡세게 걸면 놓칠 수 있어서,
+    '대략 관련 가능성'만 통과시키고, 실제는 classify_item()로 카테고리 분류 후 전송합니다.
+    """
+    return _RE_KEYWORDS.search(text) is not None
+
+
+def classify_item(text: str) -> Optional[str]:
+    """
+    카테고리 분류:
+    - 수출
+    - 융자·자금
+    - R&D·사업화(과제/실증/지원사업 포함)
+    - 전북(전북특별자치도 포함, 전 시·군)
+    - 충남·천안(요청 범위: 충남/천안/천안시)
+    기타는 None 반환 (전송하지 않음)
+    """
+    for pattern, category in CATEGORY_ORDER:
+        if pattern.search(text):
+            return category
+
+    return None
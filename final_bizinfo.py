@@ -1,73 +1,111 @@
 import os
-import json
+import argparse
 import time
-import requests
-from typing import List, Dict, Any
+import ijson
+import msgpack
+import orjson
+from typing import List, Dict, Callable, Iterator, Optional, Protocol, Tuple
+
+from http_client import SESSION, make_telegram_sender
+from filters import CATEGORY_ORDER, classify_item, classify_text, match_text, matches_keywords
 
 BIZINFO_API_URL = "https://www.bizinfo.go.kr/uss/rss/bizinfoApi.do"
-SEEN_PATH = "seen.json"
-
-# 1) 키워드(최종 필터) - 너무 넓으면 폭탄이 나서, 아래 matches_keywords는 "완화"로 유지하고
-#    실제 전송은 classify_item()으로 카테고리화 + 요약 전송으로 운영합니다.
-KEYWORDS = [
-    "전북", "전라북도", "전북특별자치도",
-    "충남", "충청남도", "천안", "천안시",
-    "융자", "대출", "자금", "자금지원", "정책자금", "보증", "이차보전",
-    "수출", "수출지원", "해외진출", "바우처", "수출바우처",
-    "과제", "R&D", "r&d", "연구개발", "지원사업", "사업화", "실증", "PoC", "테스트베드", "검증"
-]
-
-# 2) Bizinfo 해시태그(1차 필터) - 너무 좁으면 놓치고, 너무 넓으면 많아집니다.
+SEEN_PATH = "seen.mpk"
+LEGACY_SEEN_PATH = "seen.json"  # 예전 JSON 포맷 (seen.mpk가 없을 때 1회만 읽음)
+
+# seen은 {seq: 마지막으로 목록에서 본 시각(epoch 초)} 로 보관하고,
+# 이 기간 동안 한 번도 목록에 안 나온 항목은 저장 시 버립니다 (파일이 끝없이 커지는 것 방지)
+SEEN_TTL_DAYS = 90
+
+# Bizinfo 해시태그(1차 필터) - 너무 좁으면 놓치고, 너무 넓으면 많아집니다.
 #    운영하면서 필요하면 조정하세요.
 HASHTAGS = ["전북", "충남", "수출"]
 
 
-def load_seen() -> set:
-    if not os.path.exists(SEEN_PATH):
-        return set()
+def load_seen() -> Dict[str, int]:
     try:
-        with open(SEEN_PATH, "r", encoding="utf-8") as f:
-            return set(json.load(f))
+        if os.path.exists(SEEN_PATH):
+            with open(SEEN_PATH, "rb") as f:
+                data = msgpack.unpackb(f.read(), raw=False)
+        elif os.path.exists(LEGACY_SEEN_PATH):
+            with open(LEGACY_SEEN_PATH, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            return {}
     except Exception:
-        return set()
+        return {}
 
+    if isinstance(data, dict):
+        return data
+    # 예전 포맷(seq 리스트)은 시각 정보가 없으니 지금 본 것으로 간주
+    now = int(time.time())
+    return {seq: now for seq in data}
 
-def save_seen(seen: set):
-    with open(SEEN_PATH, "w", encoding="utf-8") as f:
-        json.dump(sorted(list(seen)), f, ensure_ascii=False, indent=2)
 
+def save_seen(seen: Dict[str, int]):
+    cutoff = int(time.time()) - SEEN_TTL_DAYS * 86400
+    keep = {seq: ts for seq, ts in seen.items() if ts >= cutoff}
 
-def normalize_items(data: Any) -> List[Dict]:
-    """
-    Bizinfo API JSON 응답 표준화:
-    - data가 list -> [{...},{...}] 형태면 그대로
-    - data가 dict ->
-        - jsonArray가 list 인 경우: 그 list가 곧 공고 리스트
-        - jsonArray가 dict 인 경우: jsonArray.item 에 공고 리스트가 있음
-    """
-    if isinstance(data, list):
-        return [x for x in data if isinstance(x, dict)]
+    # 임시 파일에 다 쓴 뒤 교체 -> 쓰는 도중 죽어도 기존 seen 파일은 그대로 남음
+    tmp = SEEN_PATH + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(msgpack.packb(keep))
+    os.replace(tmp, SEEN_PATH)
 
-    if isinstance(data, dict):
-        json_array = data.get("jsonArray", None)
 
-        if isinstance(json_array, list):
-            return [x for x in json_array if isinstance(x, dict)]
+class Readable(Protocol):
+    # ijson.parse 가 요구하는 최소 인터페이스 (r.raw, _HeadTee 모두 해당)
+    def read(self, n: int = -1) -> bytes: ...
 
-        if isinstance(json_array, dict):
-            items = json_array.get("item", [])
-            if isinstance(items, dict):
-                return [items]
-            if isinstance(items, list):
-                return [x for x in items if isinstance(x, dict)]
-            return []
 
-        return []
+class _HeadTee:
+    """
+    스트림을 그대로 넘기면서 앞부분(limit 바이트)만 따로 보관 -> 파싱 실패 시 DEBUG 미리보기용
+    """
+    def __init__(self, fp: Readable, limit: int = 500):
+        self.fp = fp
+        self.limit = limit
+        self.head = b""
 
-    return []
+    def read(self, n: int = -1) -> bytes:
+        b = self.fp.read(n)
+        if len(self.head) < self.limit:
+            self.head += b[:self.limit - len(self.head)]
+        return b
 
 
-def fetch_bizinfo_items(crtfc_key: str, search_cnt: int = 200) -> List[Dict]:
+def iter_items(fp: Readable) -> Iterator[Dict]:
+    """
+    Bizinfo API JSON 응답을 스트리밍 파싱해서 공고 dict를 하나씩 내보냅니다.
+    (응답 전체를 dict 트리로 만들지 않음)
+    - 최상위가 list -> [{...},{...}]               : prefix "item"
+    - jsonArray가 list 인 경우                     : prefix "jsonArray.item"
+    - jsonArray가 dict 인 경우 (jsonArray.item)    : prefix "jsonArray.item" (단건) / "jsonArray.item.item" (list)
+    """
+    prefixes = None
+    builder = None
+    depth = 0
+
+    for prefix, event, value in ijson.parse(fp):
+        if prefixes is None:
+            prefixes = ("item",) if event == "start_array" else ("jsonArray.item", "jsonArray.item.item")
+
+        if builder is None:
+            if event != "start_map" or prefix not in prefixes:
+                continue
+            builder = ijson.ObjectBuilder()
+
+        builder.event(event, value)
+        if event == "start_map":
+            depth += 1
+        elif event == "end_map":
+            depth -= 1
+            if depth == 0:
+                yield builder.value
+                builder = None
+
+
+def fetch_bizinfo_items(crtfc_key: str, search_cnt: int = 200) -> Iterator[Dict]:
     params = {
         "crtfcKey": crtfc_key,
         "dataType": "json",
@@ -75,164 +113,65 @@ def fetch_bizinfo_items(crtfc_key: str, search_cnt: int = 200) -> List[Dict]:
         "hashtags": ",".join(HASHTAGS),
     }
 
-    r = requests.get(BIZINFO_API_URL, params=params, timeout=30)
-    r.raise_for_status()
+    with SESSION.get(BIZINFO_API_URL, params=params, timeout=30, stream=True) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True  # gzip 응답도 풀면서 읽기
 
-    data = r.json()
+        fp = _HeadTee(r.raw)
+        n = 0
+        for it in iter_items(fp):
+            n += 1
+            yield it
 
-    items = normalize_items(data)
-    if not items:
-        preview = str(data)
-        if len(preview) > 500:
-            preview = preview[:500] + " ..."
+    if not n:
+        preview = fp.head.decode("utf-8", errors="replace")
+        if len(fp.head) >= fp.limit:
+            preview += " ..."
         print("DEBUG: Bizinfo 응답이 공고 리스트로 파싱되지 않았습니다.")
-        print("DEBUG: type(data) =", type(data))
         print("DEBUG: preview =", preview)
 
-    return items
 
+def item_title(it: Dict) -> str:
+    return it.get("title") or it.get("pblancNm") or "(제목 없음)"
 
-def matches_keywords(item: Dict) -> bool:
-    """
-    1차 완화 필터: 여기서 너무 빡세게 걸면 놓칠 수 있어서,
-    '대략 관련 가능성'만 통과시키고, 실제는 classify_item()로 카테고리 분류 후 전송합니다.
-    """
-    text = " ".join([
-        str(item.get("title", "")),
-        str(item.get("pblancNm", "")),
-        str(item.get("description", "")),
-        str(item.get("author", "")),
-        str(item.get("excInsttNm", "")),
-        str(item.get("hashTags", "")),
-        str(item.get("reqstDt", "")),
-        str(item.get("link", "")),
-    ])
-    return any(k in text for k in KEYWORDS)
 
+def item_link(it: Dict) -> str:
+    return it.get("link") or it.get("pblancUrl") or ""
 
-def classify_item(item: Dict) -> str:
-    """
-    카테고리 분류:
-    - 수출
-    - 융자·자금
-    - R&D·사업화(과제/실증/지원사업 포함)
-    - 전북(전북특별자치도 포함, 전 시·군)
-    - 충남·천안(요청 범위: 충남/천안/천안시)
-    기타는 None 반환 (전송하지 않음)
-    """
-    text = " ".join([
-        str(item.get("title", "")),
-        str(item.get("pblancNm", "")),
-        str(item.get("description", "")),
-        str(item.get("hashTags", "")),
-        str(item.get("hashtags", "")),
-        str(item.get("reqstDt", "")),
-        str(item.get("link", "")),
-    ])
 
-    JEONBUK_TERMS = [
-        "전북", "전라북도", "전북특별자치도",
-        "전주시", "군산시", "익산시", "정읍시", "남원시", "김제시",
-        "완주군", "진안군", "무주군", "장수군", "임실군", "순창군",
-        "고창군", "부안군"
-    ]
-
-    # 충남은 아직 "충남/충청남도/천안" 중심 (원하면 충남 전 시·군도 확장 가능)
-    CHUNGNAM_TERMS = ["충남", "충청남도", "천안", "천안시"]
-
-    FIN_TERMS = ["융자", "대출", "정책자금", "보증", "이차보전", "자금", "자금지원", "운전자금", "시설자금"]
-    EXPORT_TERMS = ["수출", "해외진출", "수출지원", "수출바우처", "바우처", "해외마케팅", "해외전시", "무역", "통상"]
-    RND_TERMS = ["과제", "R&D", "r&d", "연구개발", "지원사업", "사업화", "실증", "PoC", "poc", "테스트베드", "검증", "시범", "데모"]
-
-    is_exp = any(k in text for k in EXPORT_TERMS)
-    is_fin = any(k in text for k in FIN_TERMS)
-    is_rnd = any(k in text for k in RND_TERMS)
-    is_jb = any(k in text for k in JEONBUK_TERMS)
-    is_cn = any(k in text for k in CHUNGNAM_TERMS)
-
-    # 우선순위: 목적형(수출/금융/R&D) → 지역
-    if is_exp:
-        return "수출"
-    if is_fin:
-        return "융자·자금"
-    if is_rnd:
-        return "R&D·사업화"
-    if is_jb:
-        return "전북"
-    if is_cn:
-        return "충남·천안"
-
-    return None
-
-
-def telegram_send(bot_token: str, chat_id: str, message: str):
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    payload = {
-        "chat_id": chat_id,
-        "text": message,
-        "disable_web_page_preview": True,
-    }
-    r = requests.post(url, data=payload, timeout=30)
-    r.raise_for_status()
+def item_period(it: Dict) -> str:
+    return it.get("reqstDt") or it.get("reqstBeginEndDe") or ""
 
 
 def build_category_message(category: str, items: List[Dict], max_items: int = 10) -> str:
     """
     카테고리별 '요약 1메시지' 생성: 폭탄 방지 핵심
     """
-    def _title(it: Dict) -> str:
-        return it.get("title") or it.get("pblancNm") or "(제목 없음)"
-
-    def _link(it: Dict) -> str:
-        return it.get("link") or it.get("pblancUrl") or ""
-
-    def _period(it: Dict) -> str:
-        return it.get("reqstDt") or it.get("reqstBeginEndDe") or ""
-
     lines = [
         f"📌 [기업마당 신규 알림 | {category}]",
         f"총 {len(items)}건 (표시 {min(len(items), max_items)}건)"
     ]
 
     for i, it in enumerate(items[:max_items], 1):
-        lines.append(f"\n{i}. {_title(it)}\n   - 신청: {_period(it)}\n   - {_link(it)}")
+        lines.append(f"\n{i}. {item_title(it)}\n   - 신청: {item_period(it)}\n   - {item_link(it)}")
 
     return "\n".join(lines)
 
 
-def main():
-    crtfc_key = os.environ.get("BIZINFO_CRTFC_KEY", "").strip()
-    bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "").strip()
-    chat_id = os.environ.get("TELEGRAM_CHAT_ID", "").strip()
-
-    if not crtfc_key or not bot_token or not chat_id:
-        raise SystemExit(
-            "환경변수(BIZINFO_CRTFC_KEY, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)가 비어있습니다.\n"
-            "GitHub Actions Secrets에 3개 모두 있는지 확인하세요.\n"
-        )
-
-    seen = load_seen()
-    items = fetch_bizinfo_items(crtfc_key, search_cnt=200)
-
-    if not items:
-        print("공고 리스트를 가져오지 못했습니다. 위 DEBUG 내용을 확인하세요.")
-        return
-
-    # 신규 + 1차 필터 통과만 추림
-    new_hits = []
-    for it in items:
-        seq = str(it.get("seq") or it.get("pblancId") or it.get("link") or "")
-        if not seq:
-            continue
-        if seq in seen:
-            continue
-        if matches_keywords(it):
-            new_hits.append((seq, it))
+def format_message(it: Dict, category: Optional[str] = None) -> str:
+    """
+    건별 발송(--mode=per-item)용 1공고 1메시지
+    """
+    header = "📌 [기업마당 신규 알림]" if not category else f"📌 [기업마당 신규 알림 | {category}]"
+    return "\n".join([
+        header,
+        f"• 제목: {item_title(it)}",
+        f"• 신청: {item_period(it)}",
+        f"• 링크: {item_link(it)}",
+    ])
 
-    if not new_hits:
-        print("신규 조건 일치 공고 없음")
-        return
 
+def send_by_category(send: Callable[[str], None], new_hits: List[Tuple[str, Dict]], seen: Dict[str, int], now: int) -> int:
     # ✅ 폭주 방지: 하루 처리 상한 (원하면 30/100 등으로 변경)
     top = new_hits[:60]
 
@@ -241,7 +180,7 @@ def main():
     seq_by_cat: Dict[str, List[str]] = {}
 
     for seq, it in top:
-        cat = classify_item(it)
+        cat = classify_item(classify_text(it))
         if not cat:
             continue
         grouped.setdefault(cat, []).append(it)
@@ -252,26 +191,96 @@ def main():
         print("신규 공고는 있으나 지정한 카테고리(수출/융자/R&D/전북/충남)에 해당 없음")
         # 그래도 중복 폭주를 막으려면 seen 처리할지 선택인데,
         # 여기선 '알림 안 보낸 건'은 다시 뜰 수 있게 seen 처리 안 함.
-        return
+        return 0
 
     # ✅ 발송 순서 고정
-    order = ["수출", "융자·자금", "R&D·사업화", "전북", "충남·천안"]
+    order = [category for _, category in CATEGORY_ORDER]
 
     sent_msgs = 0
     for cat in order:
         if cat not in grouped:
             continue
         msg = build_category_message(cat, grouped[cat], max_items=10)
-        telegram_send(bot_token, chat_id, msg)
+        # 순서 보장을 위해 순차 발송 (발송 간격은 make_telegram_sender에서 조절)
+        send(msg)
         sent_msgs += 1
-        time.sleep(0.8)
 
-        # ✅ 발송한 것만 seen 처리
+        # ✅ 발송한 것만 seen 처리, 이후 발송이 실패해도 다음 실행에서 재발송되지 않도록 바로 저장
         for seq in seq_by_cat.get(cat, []):
-            seen.add(seq)
+            seen[seq] = now
+        save_seen(seen)
 
-    save_seen(seen)
     print(f"카테고리 요약 발송 완료: {sent_msgs}개 메시지")
+    return sent_msgs
+
+
+def send_per_item(send: Callable[[str], None], new_hits: List[Tuple[str, Dict]], seen: Dict[str, int], now: int) -> int:
+    # 너무 많으면 상위 30개만 발송
+    top = new_hits[:30]
+    for seq, it in top:
+        send(format_message(it, classify_item(classify_text(it))))
+        seen[seq] = now
+        save_seen(seen)
+
+    print(f"건별 발송 완료: {len(top)}건")
+    return len(top)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="기업마당 신규 공고 텔레그램 알림")
+    parser.add_argument(
+        "--mode",
+        choices=["category", "per-item"],
+        default="category",
+        help="category: 카테고리별 요약 메시지(기본) / per-item: 공고 1건당 1메시지",
+    )
+    args = parser.parse_args(argv)
+
+    crtfc_key = os.environ.get("BIZINFO_CRTFC_KEY", "").strip()
+    bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "").strip()
+    chat_id = os.environ.get("TELEGRAM_CHAT_ID", "").strip()
+
+    if not crtfc_key or not bot_token or not chat_id:
+        raise SystemExit(
+            "환경변수(BIZINFO_CRTFC_KEY, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)가 비어있습니다.\n"
+            "GitHub Actions Secrets에 3개 모두 있는지 확인하세요.\n"
+        )
+
+    seen = load_seen()
+    now = int(time.time())
+    dget = dict.get  # 루프 안에서 it.get 바운드 메서드 생성 생략
+
+    # 신규 + 1차 필터 통과만 추림 (응답을 받는 대로 한 건씩 처리)
+    fetched = 0
+    new_hits = []
+    for it in fetch_bizinfo_items(crtfc_key, search_cnt=200):
+        fetched += 1
+        seq = str(dget(it, "seq") or dget(it, "pblancId") or dget(it, "link") or "")
+        if not seq:
+            continue
+        if seq in seen:
+            seen[seq] = now  # 아직 목록에 있는 항목은 만료되지 않도록 갱신
+            continue
+        if matches_keywords(match_text(it)):
+            new_hits.append((seq, it))
+
+    if not fetched:
+        print("공고 리스트를 가져오지 못했습니다. 위 DEBUG 내용을 확인하세요.")
+        return
+
+    if not new_hits:
+        save_seen(seen)
+        print("신규 조건 일치 공고 없음")
+        return
+
+    # 조회/seen/1차 필터는 모드와 상관없이 한 번만 수행하고, 발송 방식만 분기
+    send = make_telegram_sender(SESSION, bot_token, chat_id)
+    if args.mode == "per-item":
+        send_per_item(send, new_hits, seen, now)
+    else:
+        send_by_category(send, new_hits, seen, now)
+
+    save_seen(seen)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+"""
+IRIS / K-Startup 목록 페이지용 조건부 GET(ETag / Last-Modified) 캐시.
+
+지난 실행의 ETag/Last-Modified를 http_cache.json에, 그때의 파싱 결과를 last_items.json에 보관해 두고
+다음 실행에서 If-None-Match / If-Modified-Since로 요청합니다.
+서버가 304(변경 없음)를 주면 HTML 다운로드와 파싱을 건너뛰고 보관해 둔 결과를 그대로 씁니다.
+캐시 항목에는 파서 버전을 함께 기록하며, 버전이 다르면(파서를 고친 뒤) 캐시 미스로 보고 새로 받습니다.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, List
+
+import orjson
+import requests
+
+CACHE_PATH = "http_cache.json"  # {url: {"etag": ..., "last_modified": ..., "version": ...}}
+ITEMS_PATH = "last_items.json"  # {url: [파싱 결과, ...]}
+
+# alerts_main에서 여러 스크래퍼가 동시에 같은 캐시 파일을 갱신하므로 쓰기는 직렬화
+_LOCK = threading.Lock()
+
+
+def _load(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save(path: str, data: Dict[str, Any]):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(data))
+    os.replace(tmp, path)
+
+
+def fetch_parsed(
+    session: requests.Session,
+    url: str,
+    headers: Dict[str, str],
+    parse: Callable[[str], List[Dict]],
+    version: str,
+    timeout: int = 30,
+) -> List[Dict]:
+    """
+    url을 조건부 GET으로 받아 parse(html) 결과를 반환합니다.
+    304면 지난 실행의 parse 결과를 그대로 반환합니다.
+    version은 parse의 버전 태그로, 파서를 바꾸면 올려서 이전 결과를 무효화합니다.
+    """
+    entry = _load(CACHE_PATH).get(url) or {}
+    cached_items = _load(ITEMS_PATH).get(url)
+    # 다른 버전의 파서가 만든 결과는 쓰지 않음
+    if entry.get("version") != version:
+        cached_items = None
+
+    req_headers = dict(headers)
+    # 보관된 파싱 결과가 있을 때만 조건부 요청 (304를 받아도 돌려줄 게 없으면 의미 없음)
+    if cached_items is not None:
+        if entry.get("etag"):
+            req_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            req_headers["If-Modified-Since"] = entry["last_modified"]
+
+    r = session.get(url, headers=req_headers, timeout=timeout)
+    if r.status_code == 304 and cached_items is not None:
+        return cached_items
+    r.raise_for_status()
+
+    items = parse(r.text)
+
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    with _LOCK:
+        validators = _load(CACHE_PATH)
+        last_items = _load(ITEMS_PATH)
+        if etag or last_modified:
+            validators[url] = {"etag": etag, "last_modified": last_modified, "version": version}
+            last_items[url] = items
+        else:
+            validators.pop(url, None)
+            last_items.pop(url, None)
+        _save(CACHE_PATH, validators)
+        _save(ITEMS_PATH, last_items)
+
+    return items
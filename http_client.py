@@ -0,0 +1,52 @@
+"""
+세 알림 스크립트(Bizinfo / IRIS / K-Startup)가 같이 쓰는 HTTP 세션과 텔레그램 전송 함수.
+
+모든 upstream 조회와 텔레그램 발송을 하나의 커넥션 풀로 재사용해서
+매 요청마다 TCP/TLS 핸드셰이크를 새로 하지 않도록 합니다.
+"""
+import functools
+import threading
+import time
+from typing import Callable, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/sendMessage"
+
+# 같은 채팅방으로 보내는 메시지 사이 최소 간격(초)
+# alerts_main에서 세 스크립트가 동시에 같은 채팅방으로 보내므로, 스크립트별 sleep이 아니라
+# 프로세스 전체에서 간격을 맞춤 (텔레그램 429는 POST라 재시도되지 않고 바로 실패)
+TELEGRAM_MIN_INTERVAL = 1.0
+_SEND_LOCK = threading.Lock()
+_last_sent: Dict[str, float] = {}  # {chat_id: 마지막 발송 시각(monotonic)}
+
+# 429/5xx는 짧게 재시도 (urllib3 기본값상 POST는 재시도하지 않아 텔레그램 중복 발송 없음)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+
+def make_telegram_sender(session: requests.Session, bot_token: str, chat_id: str) -> Callable[[str], None]:
+    """
+    봇 URL과 고정 파라미터는 한 번만 만들어 두고, 메시지마다 text만 바꿔서 보내는 함수를 반환합니다.
+    """
+    post = functools.partial(session.post, TELEGRAM_API_URL.format(token=bot_token), timeout=30)
+
+    def send(message: str):
+        # 발송 자체도 락 안에서 해서, 여러 스레드가 보내도 한 번에 하나씩 간격을 두고 나가도록 함
+        with _SEND_LOCK:
+            wait = _last_sent.get(chat_id, 0.0) + TELEGRAM_MIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                r = post(data={"chat_id": chat_id, "text": message, "disable_web_page_preview": True})
+            finally:
+                _last_sent[chat_id] = time.monotonic()
+        r.raise_for_status()
+
+    return send
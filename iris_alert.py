@@ -2,40 +2,114 @@ import os
 import re
 import time
 from typing import List, Dict, Optional
-import requests
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from http_cache import fetch_parsed
+from http_client import SESSION, make_telegram_sender
 
 
 IRIS_LIST_URL = "https://www.iris.go.kr/contents/retrieveBsnsAncmBtinSituListView.do"
+IRIS_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; IRISAlertBot/1.0)",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.7",
+}
+# 파싱 로직을 바꾸면 올릴 것 (http_cache에 보관된 지난 파싱 결과 무효화)
+IRIS_PARSER_VERSION = "2"
+
+# 패턴 예시(페이지에 실제 표기): 
+# "농림축산식품부 > 농림식품기술기획평가원"
+# "2026년도 ... 공고"
+# "공고번호 : ... 공고일자 :2026-02-13 공고상태 : 공고접수중 ..."
+_MINISTRY_RE = re.compile(r".+\s>\s.+")
+_DATE_RE = re.compile(r"공고일자\s*:\s*(\d{4}-\d{2}-\d{2})")
+_STATUS_RE = re.compile(r"공고상태\s*:\s*([^\s]+)")
+
+
+def fetch_receiving_items(limit: int = 30) -> List[Dict]:
+    # 페이지가 지난 실행 이후 바뀌지 않았으면(304) 다운로드/파싱 없이 지난 결과 사용
+    # limit도 결과에 영향을 주므로 버전 태그에 포함
+    return fetch_parsed(
+        SESSION,
+        IRIS_LIST_URL,
+        IRIS_HEADERS,
+        lambda html: extract_receiving_items(html, limit=limit),
+        version=f"{IRIS_PARSER_VERSION}:{limit}",
+    )
+
+
+# 공고 1건 = '공고번호' 메타 텍스트를 가진 가장 안쪽 li/tr
+_ROW_XPATH = (
+    '//*[self::li or self::tr][.//text()[contains(., "공고번호")]]'
+    '[not(.//*[self::li or self::tr][.//text()[contains(., "공고번호")]])]'
+)
+_SKIP_LABELS = ("접수중", "마감", "접수예정")
 
 
-def telegram_send(bot_token: str, chat_id: str, message: str):
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    payload = {
-        "chat_id": chat_id,
-        "text": message,
-        "disable_web_page_preview": True,
-    }
-    r = requests.post(url, data=payload, timeout=30)
-    r.raise_for_status()
+def extract_receiving_items(html: str, limit: int = 30) -> List[Dict]:
+    """
+    IRIS '사업공고' 페이지에서 '접수중' 공고를 추출합니다.
+    공고 행(li/tr)을 XPath로 바로 찾아 파싱하고, 레이아웃이 바뀌어 행을 못 찾으면
+    예전 텍스트 패턴 방식(extract_receiving_items_from_text)으로 대체합니다.
+    """
+    try:
+        items = extract_receiving_items_from_rows(html, limit)
+    except Exception as e:
+        print(f"DEBUG: IRIS XPath 파싱 실패, 텍스트 방식으로 대체: {e}")
+        items = []
+    if items:
+        return items
+    return extract_receiving_items_from_text(html, limit)
+
+
+def extract_receiving_items_from_rows(html: str, limit: int = 30) -> List[Dict]:
+    doc = lxml_html.fromstring(html)
+    items: List[Dict] = []
 
+    for row in doc.xpath(_ROW_XPATH):
+        lines = [t.strip() for t in row.itertext() if t.strip()]
+
+        org = None
+        title = None
+        for ln in lines:
+            if org is None:
+                if ">" in ln and _MINISTRY_RE.fullmatch(ln):
+                    org = ln
+                continue
+            if ln in _SKIP_LABELS or ln.startswith(("공고번호", "공고일자", "공고상태")):
+                continue
+            title = ln
+            break
+
+        # 메타가 여러 태그로 쪼개져 있어도 잡히도록 행 전체 텍스트에서 검색
+        meta = " ".join(lines)
+        m = _DATE_RE.search(meta)
+        s = _STATUS_RE.search(meta)
+        pub_date = m.group(1) if m else None
+        status = s.group(1) if s else None
+
+        # 행 단위 파싱은 페이지의 모든 섹션(접수예정/마감 포함)을 훑으므로,
+        # 공고상태가 '접수중'으로 확인된 행만 수집
+        if org and title and status and "접수중" in status:
+            items.append({
+                "org": org,
+                "title": title,
+                "pub_date": pub_date or "",
+                "status": status or "",
+                "link": IRIS_LIST_URL,
+            })
+            if len(items) >= limit:
+                break
 
-def fetch_html(url: str) -> str:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; IRISAlertBot/1.0)",
-        "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.7",
-    }
-    r = requests.get(url, headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.text
+    return items
 
 
-def extract_receiving_items(html: str, limit: int = 30) -> List[Dict]:
+def extract_receiving_items_from_text(html: str, limit: int = 30) -> List[Dict]:
     """
     IRIS '사업공고' 페이지에서 '접수중' 공고를 텍스트 패턴 기반으로 추출합니다.
     페이지 구조가 바뀌어도 비교적 버티도록 HTML을 텍스트로 변환 후 파싱합니다.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
     text = soup.get_text("\n", strip=True)
 
     # '#### 접수중' 이후 영역을 우선 사용 (페이지에 실제로 표시됨) :contentReference[oaicite:1]{index=1}
@@ -52,19 +126,11 @@ def extract_receiving_items(html: str, limit: int = 30) -> List[Dict]:
     items: List[Dict] = []
     i = 0
 
-    # 패턴 예시(페이지에 실제 표기): 
-    # "농림축산식품부 > 농림식품기술기획평가원"
-    # "2026년도 ... 공고"
-    # "공고번호 : ... 공고일자 :2026-02-13 공고상태 : 공고접수중 ..."
-    ministry_pattern = re.compile(r".+\s>\s.+")
-    date_pattern = re.compile(r"공고일자\s*:\s*(\d{4}-\d{2}-\d{2})")
-    status_pattern = re.compile(r"공고상태\s*:\s*([^\s]+)")
-
     while i < len(lines) and len(items) < limit:
         ln = lines[i]
 
-        # 기관 라인
-        if ministry_pattern.fullmatch(ln):
+        # 기관 라인 ('>'가 없는 줄은 정규식까지 가지 않고 바로 건너뜀)
+        if ">" in ln and _MINISTRY_RE.fullmatch(ln):
             org = ln
             title = None
             meta = None
@@ -76,7 +142,7 @@ def extract_receiving_items(html: str, limit: int = 30) -> List[Dict]:
                     meta = lines[j]
                     break
                 # '접수중' 같은 단독 라벨은 스킵
-                if lines[j] in ("접수중", "마감", "접수예정"):
+                if lines[j] in _SKIP_LABELS:
                     j += 1
                     continue
                 # 제목 후보
@@ -87,10 +153,10 @@ def extract_receiving_items(html: str, limit: int = 30) -> List[Dict]:
             pub_date = None
             status = None
             if meta:
-                m = date_pattern.search(meta)
+                m = _DATE_RE.search(meta)
                 if m:
                     pub_date = m.group(1)
-                s = status_pattern.search(meta)
+                s = _STATUS_RE.search(meta)
                 if s:
                     status = s.group(1)
 
@@ -133,12 +199,12 @@ def main():
     if not bot_token or not chat_id:
         raise SystemExit("환경변수(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)가 비어있습니다. GitHub Secrets를 확인하세요.")
 
-    html = fetch_html(IRIS_LIST_URL)
-    items = extract_receiving_items(html, limit=40)
+    items = fetch_receiving_items(limit=40)
 
     # 접수중 요약 1메시지로 발송(폭탄 방지)
     msg = build_message(items, max_items=12)
-    telegram_send(bot_token, chat_id, msg)
+    send = make_telegram_sender(SESSION, bot_token, chat_id)
+    send(msg)
     time.sleep(0.2)
 
 
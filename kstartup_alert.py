@@ -1,11 +1,12 @@
 import os
-import json
-import time
 import hashlib
-import requests
-from typing import List, Dict, Any
+import orjson
+from typing import List, Dict, Any, Set, Tuple
 from bs4 import BeautifulSoup
 
+from http_cache import fetch_parsed
+from http_client import SESSION, make_telegram_sender
+
 # K-Startup 공고 목록 (모집중)
 KSTARTUP_URLS = [
     "https://www.k-startup.go.kr/web/contents/bizpbanc-ongoing.do",
@@ -28,25 +29,18 @@ KEYWORDS = [
     "수출", "수출지원", "해외진출", "바우처", "수출바우처", "글로벌", "해외",
 ]
 
-# 텔레그램
-def telegram_send(bot_token: str, chat_id: str, message: str):
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    payload = {"chat_id": chat_id, "text": message, "disable_web_page_preview": True}
-    r = requests.post(url, data=payload, timeout=30)
-    r.raise_for_status()
-
 def load_seen() -> set:
     if not os.path.exists(SEEN_PATH):
         return set()
     try:
-        with open(SEEN_PATH, "r", encoding="utf-8") as f:
-            return set(json.load(f))
+        with open(SEEN_PATH, "rb") as f:
+            return set(orjson.loads(f.read()))
     except Exception:
         return set()
 
 def save_seen(seen: set):
-    with open(SEEN_PATH, "w", encoding="utf-8") as f:
-        json.dump(sorted(list(seen)), f, ensure_ascii=False, indent=2)
+    with open(SEEN_PATH, "wb") as f:
+        f.write(orjson.dumps(sorted(seen), option=orjson.OPT_INDENT_2))
 
 def norm(s: str) -> str:
     return (s or "").strip()
@@ -56,55 +50,91 @@ def contains_keywords(text: str) -> bool:
     return any(k in t for k in KEYWORDS)
 
 def make_id(title: str, link: str) -> str:
+    # 중복 판별용 키일 뿐이라 암호학적 해시가 필요 없음 -> blake2b 128bit(32자리 hex)
+    raw = f"{title}|{link}".encode("utf-8", errors="ignore")
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def legacy_make_id(title: str, link: str) -> str:
+    # ⚠️ 마이그레이션 전용: 예전 seen_kstartup.json은 sha256(64자리 hex) 키로 저장되어 있음
     raw = f"{title}|{link}".encode("utf-8", errors="ignore")
     return hashlib.sha256(raw).hexdigest()
 
-def fetch_kstartup_items() -> List[Dict[str, str]]:
+KSTARTUP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; bizinfo-alert/1.0)"
+}
+# 파싱 로직을 바꾸면 올릴 것 (http_cache에 보관된 지난 파싱 결과 무효화)
+KSTARTUP_PARSER_VERSION = "3"
+
+# 공고 목록 영역의 링크만 보도록 범위 제한 (메뉴/푸터/배너 링크 제외)
+# 페이지 개편에 대비해 후보를 여러 개 두고, 잡힌 링크 중 실제 공고 링크(ANNOUNCE_HREF_MARK)가
+# 하나도 없으면 목록 영역을 잘못 짚은 것으로 보고 페이지 전체 a 태그로 대체
+ANNOUNCE_HREF_MARK = "bizpbanc"
+LIST_ANCHOR_SELECTORS = (
+    "div.board_list a",
+    "ul.list_ty4 a",
+    "div.bizpbanc_list a",
+)
+
+def parse_kstartup_page(html: str) -> List[Dict[str, str]]:
     items: List[Dict[str, str]] = []
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; bizinfo-alert/1.0)"
-    }
+    soup = BeautifulSoup(html, "lxml")
+
+    # K-Startup 페이지는 구조가 바뀔 수 있어서 "링크+제목" 중심으로 최대한 안전하게 수집
+    # 공고 링크 후보: 목록 영역의 a 태그 (목록 영역을 못 찾으면 전체 a 태그)
+    anchors = soup.select(", ".join(LIST_ANCHOR_SELECTORS))
+    if not any(ANNOUNCE_HREF_MARK in (a.get("href") or "") for a in anchors):
+        anchors = soup.select("a")
+    for a in anchors:
+        title = norm(a.get_text(" ", strip=True))
+        href = a.get("href") or ""
+        if not title or len(title) < 6:
+            continue
 
-    for url in KSTARTUP_URLS:
-        r = requests.get(url, headers=headers, timeout=30)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-
-        # K-Startup 페이지는 구조가 바뀔 수 있어서 "링크+제목" 중심으로 최대한 안전하게 수집
-        # 공고 링크 후보: a 태그 중 'bizpbanc' 관련 또는 제목처럼 보이는 것
-        for a in soup.select("a"):
-            title = norm(a.get_text(" ", strip=True))
-            href = a.get("href") or ""
-            if not title or len(title) < 6:
-                continue
+        # 링크 정규화
+        if href.startswith("/"):
+            link = "https://www.k-startup.go.kr" + href
+        elif href.startswith("http"):
+            link = href
+        else:
+            # onclick 기반 등은 제외 (필요 시 나중에 보완)
+            continue
 
-            # 링크 정규화
-            if href.startswith("/"):
-                link = "https://www.k-startup.go.kr" + href
-            elif href.startswith("http"):
-                link = href
-            else:
-                # onclick 기반 등은 제외 (필요 시 나중에 보완)
-                continue
+        # ⚠️ 키워드 필터는 여기서 하지 않음 (fetch_kstartup_items에서 적용)
+        # 이 결과는 http_cache에 그대로 보관되므로, 여기서 거르면 KEYWORDS를 바꿔도 304 동안 반영되지 않음
+        items.append({"title": title, "link": link})
 
-            # 너무 광범위하게 잡히면 노이즈가 생기므로, 키워드 필터를 통과하는 것만 보관
-            blob = f"{title} {link}"
-            if contains_keywords(blob):
-                items.append({"title": title, "link": link})
+    return items
 
-    # 중복 제거 (title+link 기준)
-    uniq = {}
-    for it in items:
-        key = make_id(it["title"], it["link"])
-        uniq[key] = it
-    return list(uniq.values())
+def fetch_kstartup_items() -> List[Dict[str, str]]:
+    items: List[Dict[str, str]] = []
+    seen_keys: Set[Tuple[str, str]] = set()  # 중복 제거 (title+link 기준)
 
-def format_message(it: Dict[str, str]) -> str:
-    return "\n".join([
-        "🚀 [K-Startup 신규 공고 알림]",
-        f"• 제목: {it.get('title','')}",
-        f"• 링크: {it.get('link','')}",
-    ])
+    for url in KSTARTUP_URLS:
+        # 페이지가 지난 실행 이후 바뀌지 않았으면(304) 다운로드/파싱 없이 지난 결과 사용
+        for it in fetch_parsed(SESSION, url, KSTARTUP_HEADERS, parse_kstartup_page, version=KSTARTUP_PARSER_VERSION):
+            # 너무 광범위하게 잡히면 노이즈가 생기므로, 키워드 필터를 통과하는 것만 보관
+            # (키워드는 대부분 제목에서 걸리므로 제목 먼저 확인)
+            if not (contains_keywords(it["title"]) or contains_keywords(it["link"])):
+                continue
+            key = (it["title"], it["link"])
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            items.append(it)
+
+    return items
+
+def build_message(items: List[Dict[str, str]], start: int = 1, part: int = 1, parts: int = 1) -> str:
+    """
+    신규 공고 여러 건을 '요약 1메시지'로 묶음 (건별 발송 폭탄 방지)
+    """
+    header = "🚀 [K-Startup 신규 공고 알림]"
+    if parts > 1:
+        header += f" ({part}/{parts})"
+    lines = [header]
+    for idx, it in enumerate(items, start):
+        lines.append(f"\n{idx}. {it.get('title','')}\n   - {it.get('link','')}")
+    return "\n".join(lines)
 
 def main():
     bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "").strip()
@@ -116,25 +146,41 @@ def main():
     seen = load_seen()
     items = fetch_kstartup_items()
 
+    # ⚠️ 1회성 마이그레이션: sha256 키(64자리)는 seen에서 분리해두고,
+    # 이번 목록에 남아있는 공고만 새 키로 옮겨 적습니다. 나머지 sha256 키는 저장 시 버려집니다.
+    legacy = {x for x in seen if len(x) == 64}
+    seen -= legacy
+
     new_hits = []
     for it in items:
         sid = make_id(it.get("title",""), it.get("link",""))
         if sid in seen:
             continue
+        if legacy and legacy_make_id(it.get("title",""), it.get("link","")) in legacy:
+            seen.add(sid)
+            continue
         new_hits.append((sid, it))
 
     if not new_hits:
+        if legacy:
+            save_seen(seen)
         print("K-Startup: 신규 조건 일치 공고 없음")
         return
 
-    # 너무 많으면 상위 30개만 발송
-    for sid, it in new_hits[:30]:
-        telegram_send(bot_token, chat_id, format_message(it))
-        seen.add(sid)
-        time.sleep(0.6)
+    # 너무 많으면 상위 30개만, 10건씩 묶어서 요약 발송
+    top = new_hits[:30]
+    chunks = [top[i:i + 10] for i in range(0, len(top), 10)]
+    send = make_telegram_sender(SESSION, bot_token, chat_id)
+    for n, chunk in enumerate(chunks, 1):
+        msg = build_message([it for _, it in chunk], start=(n - 1) * 10 + 1, part=n, parts=len(chunks))
+        send(msg)
+
+        # ✅ 발송한 것만 seen 처리, 이후 발송이 실패해도 다음 실행에서 재발송되지 않도록 바로 저장
+        for sid, _ in chunk:
+            seen.add(sid)
+        save_seen(seen)
 
-    save_seen(seen)
-    print(f"K-Startup: 발송 완료 {min(len(new_hits), 30)}건")
+    print(f"K-Startup: 발송 완료 {len(top)}건 ({len(chunks)}개 메시지)")
 
 if __name__ == "__main__":
     main()